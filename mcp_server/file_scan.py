@@ -0,0 +1,52 @@
+import logging
+import os
+import re
+from pathlib import Path
+from typing import FrozenSet, Iterator, List, Optional, Pattern, Tuple, Union
+
+log = logging.getLogger(__name__)
+
+def split_exclude_patterns(patterns: List[str]) -> Tuple[FrozenSet[str], Optional[Pattern[str]]]:
+    """Split patterns into exact directory/file names and a regex for everything else."""
+    names = frozenset(p for p in patterns if "/" not in p and "." not in p[1:])
+    rest = [p for p in patterns if p not in names]
+    return names, re.compile("|".join(map(re.escape, rest))) if rest else None
+
+def is_excluded(
+    path: Union[str, Path],
+    exclude_names: FrozenSet[str],
+    exclude_re: Optional[Pattern[str]]
+) -> bool:
+    """Check a single path the same way scandir_files filters entries."""
+    path = str(path)
+    if exclude_re and exclude_re.search(path):
+        return True
+    return not exclude_names.isdisjoint(path.split(os.sep))
+
+def scandir_files(
+    root: Union[str, Path],
+    suffix: str,
+    exclude_names: FrozenSet[str] = frozenset(),
+    exclude_re: Optional[Pattern[str]] = None
+) -> Iterator[os.DirEntry]:
+    """Recursively yield file entries under root ending in suffix.
+
+    Entries named in exclude_names are pruned before descending; exclude_re is
+    only matched against the paths of surviving files. Like Path.rglob,
+    symlinked files are yielded but symlinked directories are not descended
+    into, and unreadable directories are skipped.
+    """
+    try:
+        it = os.scandir(root)
+    except OSError as e:
+        log.warning("Error scanning directory %s: %s", root, e)
+        return
+    with it:
+        for entry in it:
+            if entry.name in exclude_names:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                yield from scandir_files(entry.path, suffix, exclude_names, exclude_re)
+            elif (entry.is_file() and entry.name.endswith(suffix)
+                    and not (exclude_re and exclude_re.search(entry.path))):
+                yield entry
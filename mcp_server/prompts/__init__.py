@@ -1,9 +1,55 @@
+import asyncio
+import functools
+import logging
+import os
+import string
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Union
 import yaml
 from dataclasses import dataclass
 import mcp.types as types
 from mcp.server.fastmcp import FastMCP
+from file_scan import is_excluded, scandir_files, split_exclude_patterns
+
+log = logging.getLogger(__name__)
+
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+_DEFAULT_TEMPLATE_DIR = Path(__file__).parent / "templates"
+
+FormatParts = Tuple[Tuple[str, Optional[str], Optional[str], Optional[str]], ...]
+# (system prompt parts, [(role, content, parts)], whether nothing needs substituting)
+CompiledTemplate = Tuple[Optional[FormatParts], List[Tuple[str, str, Optional[FormatParts]]], bool]
+
+_formatter = string.Formatter()
+
+def _compile_format(text: str) -> Optional[FormatParts]:
+   """Pre-parse a str.format template, or return None if it needs the full formatter."""
+   try:
+       parts = tuple(_formatter.parse(text))
+   except ValueError:
+       return None
+   for _, field_name, format_spec, _ in parts:
+       if field_name is not None and (not field_name.isidentifier() or "{" in format_spec):
+           return None
+   return parts
+
+def _is_static(parts: Optional[FormatParts]) -> bool:
+   return parts is not None and all(field_name is None for _, field_name, _, _ in parts)
+
+def _render(text: str, parts: Optional[FormatParts], args: Dict[str, Any]) -> str:
+   if parts is None:
+       return text.format_map(args)
+   out = []
+   for literal, field_name, format_spec, conversion in parts:
+       out.append(literal)
+       if field_name is not None:
+           value = args[field_name]
+           if conversion:
+               value = _formatter.convert_field(value, conversion)
+           out.append(format(value, format_spec))
+   return "".join(out)
 
 @dataclass
 class PromptTemplate:
@@ -15,86 +61,188 @@ class PromptTemplate:
 
 @dataclass
 class PromptConfig:
-   default_dir: Path = Path(__file__).parent / "templates"
+   default_dir: Path = _DEFAULT_TEMPLATE_DIR
    exclude_patterns: List[str] = None
 
    def __post_init__(self):
        if self.exclude_patterns is None:
            self.exclude_patterns = ["__pycache__", ".git"]
+       self._exclude_names, self._exclude_re = split_exclude_patterns(self.exclude_patterns)
 
 class PromptManager:
    def __init__(self, config: Optional[PromptConfig] = None):
        self.config = config or PromptConfig()
        self._templates: Dict[str, PromptTemplate] = {}
+       self._sources: Dict[str, Path] = {}
+       self._prompt_args: Dict[str, Tuple[types.PromptArgument, ...]] = {}
+       self._compiled: Dict[str, CompiledTemplate] = {}
+       self._static_results: Dict[str, types.GetPromptResult] = {}
 
-   def should_exclude(self, path: Path) -> bool:
-       return any(pattern in str(path) for pattern in self.config.exclude_patterns)
+   def should_exclude(self, path: Union[str, Path]) -> bool:
+       return is_excluded(path, self.config._exclude_names, self.config._exclude_re)
 
-   def load_template(self, file_path: Path) -> Optional[PromptTemplate]:
+   def read_name(self, file_path: Path) -> Optional[str]:
+       """Read the template name from its top-level ``name:`` line without parsing the whole file."""
        try:
-           content = yaml.safe_load(file_path.read_text())
-           template = PromptTemplate(**content)
-           self._templates[template.name] = template
-           return template
+           with open(file_path, encoding="utf-8") as f:
+               for line in f:
+                   if line.startswith("name:"):
+                       name = yaml.load(line, Loader=Loader)["name"]
+                       return name if isinstance(name, str) and name else None
+       except Exception:
+           pass
+       return None
+
+   def parse_template(self, file_path: Path) -> Optional[PromptTemplate]:
+       try:
+           content = yaml.load(file_path.read_bytes(), Loader=Loader)
+           return PromptTemplate(**content)
        except Exception as e:
-           print(f"Error loading prompt template {file_path}: {e}")
+           log.warning("Error loading prompt template %s: %s", file_path, e)
            return None
 
-   def register_prompt(self, mcp: FastMCP, template: PromptTemplate):
-       prompt_args = []
-       if template.arguments:
-           prompt_args = [
+   def load_template(self, file_path: Path) -> Optional[PromptTemplate]:
+       template = self.parse_template(file_path)
+       if template is not None:
+           self._templates[template.name] = template
+       return template
+
+   def scan_template(self, file_path: Path) -> Optional[Tuple[str, Optional[PromptTemplate]]]:
+       """Identify a template file without touching manager state, so it can run in a worker thread.
+
+       The template is only parsed if its name header can't be read; otherwise
+       the returned template is None so it can be loaded lazily.
+       """
+       name = self.read_name(file_path)
+       if name is not None:
+           return name, None
+       template = self.parse_template(file_path)
+       if template is None:
+           return None
+       return template.name, template
+
+   def index_template(self, file_path: Path, name: str, template: Optional[PromptTemplate] = None) -> bool:
+       """Record a scanned template, or skip it if its name is already taken.
+
+       Like FastMCP, the first template registered under a name wins.
+       """
+       if name in self._sources:
+           log.warning(
+               "Skipping prompt template %s: %s is already defined in %s",
+               file_path, name, self._sources[name]
+           )
+           return False
+       if template is not None:
+           self._templates[name] = template
+       self._sources[name] = file_path
+       return True
+
+   def get_prompt_args(self, template: PromptTemplate) -> Tuple[types.PromptArgument, ...]:
+       prompt_args = self._prompt_args.get(template.name)
+       if prompt_args is None:
+           prompt_args = tuple(
                types.PromptArgument(
                    name=arg["name"],
                    description=arg.get("description"),
                    required=arg.get("required", False)
-               ) for arg in template.arguments
-           ]
-
-       @mcp.prompt(template.name)
-       async def get_prompt(arguments: Optional[Dict[str, str]] = None) -> types.GetPromptResult:
-           try:
-               args = arguments or {}
-               messages = []
-               
-               if template.system_prompt:
-                   messages.append(types.PromptMessage(
-                       role="system",
-                       content=types.TextContent(
-                           type="text",
-                           text=template.system_prompt.format(**args)
-                       )
-                   ))
-
-               for msg in template.messages:
-                   messages.append(types.PromptMessage(
-                       role=msg["role"],
-                       content=types.TextContent(
-                           type="text",
-                           text=msg["content"].format(**args)
-                       )
-                   ))
-
-               return types.GetPromptResult(
-                   description=template.description,
-                   arguments=prompt_args,
-                   messages=messages
-               )
-           except Exception as e:
-               return types.GetPromptResult(
-                   description=template.description,
-                   arguments=prompt_args,
-                   messages=[types.PromptMessage(
-                       role="system",
-                       content=types.TextContent(
-                           type="text",
-                           text=f"Error: {str(e)}"
-                       )
-                   )]
-               )
+               ) for arg in template.arguments or []
+           )
+           self._prompt_args[template.name] = prompt_args
+       return prompt_args
+
+   def get_compiled(self, template: PromptTemplate) -> CompiledTemplate:
+       compiled = self._compiled.get(template.name)
+       if compiled is None:
+           system_parts = _compile_format(template.system_prompt) if template.system_prompt else None
+           compiled_msgs = [(msg["role"], msg["content"], _compile_format(msg["content"])) for msg in template.messages]
+           static = (
+               (not template.system_prompt or _is_static(system_parts))
+               and all(_is_static(parts) for _, _, parts in compiled_msgs)
+           )
+           compiled = (system_parts, compiled_msgs, static)
+           self._compiled[template.name] = compiled
+       return compiled
+
+   async def _dispatch(self, name: str, arguments: Optional[Dict[str, str]] = None) -> types.GetPromptResult:
+       static_result = self._static_results.get(name)
+       if static_result is not None:
+           return static_result
+
+       template = self._templates.get(name)
+       if template is None:
+           # First use: read the file off the event loop.
+           template = await asyncio.to_thread(self.get_template, name)
+       if template is None:
+           return types.GetPromptResult(
+               messages=[types.PromptMessage(
+                   role="user",
+                   content=types.TextContent(
+                       type="text",
+                       text=f"Error: failed to load prompt template {name}"
+                   )
+               )]
+           )
+
+       prompt_args = self.get_prompt_args(template)
+       try:
+           args = arguments or {}
+           system_parts, compiled_msgs, static = self.get_compiled(template)
+           messages = []
+
+           if template.system_prompt:
+               messages.append(types.PromptMessage(
+                   role="system",
+                   content=types.TextContent(
+                       type="text",
+                       text=_render(template.system_prompt, system_parts, args)
+                   )
+               ))
+
+           for role, content, parts in compiled_msgs:
+               messages.append(types.PromptMessage(
+                   role=role,
+                   content=types.TextContent(
+                       type="text",
+                       text=_render(content, parts, args)
+                   )
+               ))
+
+           result = types.GetPromptResult(
+               description=template.description,
+               arguments=prompt_args,
+               messages=messages
+           )
+           if static:
+               self._static_results[name] = result
+           return result
+       except Exception as e:
+           return types.GetPromptResult(
+               description=template.description,
+               arguments=prompt_args,
+               messages=[types.PromptMessage(
+                   role="system",
+                   content=types.TextContent(
+                       type="text",
+                       text=f"Error: {str(e)}"
+                   )
+               )]
+           )
+
+   def register_prompt(self, mcp: FastMCP, name: str):
+       dispatcher = functools.partial(self._dispatch, name)
+       # FastMCP introspects prompt functions by name and uses __doc__ as the
+       # description, neither of which a bare partial provides sensibly.
+       dispatcher.__name__ = dispatcher.__qualname__ = name
+       dispatcher.__doc__ = None
+       mcp.prompt(name)(dispatcher)
 
    def get_template(self, name: str) -> Optional[PromptTemplate]:
-       return self._templates.get(name)
+       template = self._templates.get(name)
+       if template is None and name in self._sources:
+           template = self.parse_template(self._sources[name])
+           if template is not None:
+               self._templates[name] = template
+       return template
 
 def init_prompts(
    mcp: FastMCP,
@@ -102,24 +250,33 @@ def init_prompts(
    exclude_default: bool = False,
    config: Optional[PromptConfig] = None
 ) -> PromptManager:
-   """Initialize prompts for the MCP server."""
+   """Initialize prompts for the MCP server.
+
+   Templates are only indexed by name here; each one is parsed on its first
+   invocation.
+   """
    manager = PromptManager(config)
    template_dirs = [] if template_dirs is None else template_dirs
 
    if not exclude_default:
        template_dirs.append(manager.config.default_dir)
 
+   file_paths: List[Path] = []
+
    for template_dir in template_dirs:
        if not template_dir.exists():
-           print(f"Warning: Template directory does not exist: {template_dir}")
+           log.warning("Template directory does not exist: %s", template_dir)
            continue
 
-       for file_path in template_dir.rglob("*.yaml"):
-           if not file_path.is_file() or manager.should_exclude(file_path):
-               continue
+       file_paths.extend(Path(entry.path) for entry in scandir_files(
+           template_dir, ".yaml",
+           manager.config._exclude_names, manager.config._exclude_re
+       ))
 
-           template = manager.load_template(file_path)
-           if template:
-               manager.register_prompt(mcp, template)
+   # Header reads run in parallel; indexing and FastMCP registration stay on this thread.
+   with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+       for file_path, scanned in zip(file_paths, executor.map(manager.scan_template, file_paths)):
+           if scanned and manager.index_template(file_path, *scanned):
+               manager.register_prompt(mcp, scanned[0])
 
    return manager
\ No newline at end of file
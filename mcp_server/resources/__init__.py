@@ -1,18 +1,38 @@
+import logging
+import os
+import re
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import BinaryIO, List, Optional, Dict, Any, Tuple, Union
 import json
 import yaml
 from dataclasses import dataclass
 import mcp.types as types
 from mcp.server.fastmcp import FastMCP
+from file_scan import is_excluded, scandir_files, split_exclude_patterns
 from datetime import datetime
 
+log = logging.getLogger(__name__)
+
+try:
+   import orjson
+except ImportError:
+   orjson = None
+
+# orjson reads integers wider than 64 bits as floats; leave those to json.
+_LONG_NUMBER = re.compile(rb"\d{19}")
+
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+_DEFAULT_SOURCE_DIR = Path(__file__).parent / "sources"
+
 @dataclass
 class ResourceConfig:
    uri_prefix: str = "file://"
    default_mime_type: str = "text/plain"
    mime_types: Dict[str, str] = None
    exclude_patterns: List[str] = None
+   pretty_print: bool = False
    
    def __post_init__(self):
        if self.mime_types is None:
@@ -29,15 +49,17 @@ class ResourceConfig:
            }
        if self.exclude_patterns is None:
            self.exclude_patterns = ["__pycache__", ".git", ".mypy_cache"]
+       self._exclude_names, self._exclude_re = split_exclude_patterns(self.exclude_patterns)
 
 class ResourceManager:
    def __init__(self, config: Optional[ResourceConfig] = None):
        self.config = config or ResourceConfig()
        self._resources: Dict[str, types.Resource] = {}
        self._last_modified: Dict[str, datetime] = {}
+       self._content_cache: Dict[str, Tuple[Tuple[int, int], types.Resource]] = {}
 
-   def should_exclude(self, path: Path) -> bool:
-       return any(pattern in str(path) for pattern in self.config.exclude_patterns)
+   def should_exclude(self, path: Union[str, Path]) -> bool:
+       return is_excluded(path, self.config._exclude_names, self.config._exclude_re)
 
    def get_mime_type(self, file_path: Path) -> str:
        return self.config.mime_types.get(
@@ -45,30 +67,59 @@ class ResourceManager:
            self.config.default_mime_type
        )
 
-   def parse_structured_content(self, file_path: Path, content: str) -> str:
-       try:
-           if file_path.suffix.lower() == '.json':
-               parsed = json.loads(content)
-               return json.dumps(parsed, indent=2)
-           elif file_path.suffix.lower() in ('.yaml', '.yml'):
-               parsed = yaml.safe_load(content)
-               return yaml.dump(parsed, default_flow_style=False)
-           return content
-       except Exception as e:
-           print(f"Error parsing {file_path}: {e}")
-           return content
+   def parse_structured_content(self, file_path: Path, content: Union[str, bytes, BinaryIO]) -> str:
+       """Return content as text, re-serialised if pretty_print is enabled.
+
+       Raw bytes are handed straight to the JSON/YAML parsers, which accept them.
+       YAML may also be given as an open binary stream, which libyaml reads
+       incrementally.
+       """
+       if self.config.pretty_print:
+           raw = content.encode("utf-8") if isinstance(content, str) else content
+           try:
+               if file_path.suffix.lower() == '.json':
+                   if orjson is not None and not _LONG_NUMBER.search(raw):
+                       try:
+                           return orjson.dumps(orjson.loads(raw), option=orjson.OPT_INDENT_2).decode("utf-8")
+                       except (orjson.JSONDecodeError, orjson.JSONEncodeError):
+                           # NaN and Infinity; the stdlib json accepts them.
+                           pass
+                   parsed = json.loads(raw)
+                   return json.dumps(parsed, indent=2)
+               elif file_path.suffix.lower() in ('.yaml', '.yml'):
+                   parsed = yaml.load(raw, Loader=Loader)
+                   return yaml.dump(parsed, Dumper=Dumper, default_flow_style=False)
+           except Exception as e:
+               log.warning("Error parsing %s: %s", file_path, e)
+       if not isinstance(content, (str, bytes)):
+           content.seek(0)
+           content = content.read()
+       return content.decode("utf-8") if isinstance(content, bytes) else content
+
+   def read_content(self, file_path: Path) -> str:
+       if self.config.pretty_print and file_path.suffix.lower() in ('.yaml', '.yml'):
+           with file_path.open("rb") as f:
+               return self.parse_structured_content(file_path, f)
+       return self.parse_structured_content(file_path, file_path.read_bytes())
 
    def register_resource(self, mcp: FastMCP, file_path: Path, source_parent: str):
        if self.should_exclude(file_path):
            return
+       self._register_resource(mcp, file_path, source_parent)
 
+   def _register_resource(self, mcp: FastMCP, file_path: Path, source_parent: str):
        resource_uri = f"{self.config.uri_prefix}{source_parent}/{file_path.relative_to(file_path.parent)}"
        
        @mcp.resource(uri=resource_uri)
        def get_resource() -> types.Resource:
            try:
-               content = file_path.read_text(encoding="utf-8")
-               content = self.parse_structured_content(file_path, content)
+               st = os.stat(file_path)
+               key = (st.st_mtime_ns, st.st_size)
+               cached = self._content_cache.get(resource_uri)
+               if cached and cached[0] == key:
+                   return cached[1]
+
+               content = self.read_content(file_path)
                
                resource = types.Resource(
                    uri=resource_uri,
@@ -79,13 +130,12 @@ class ResourceManager:
                )
                
                self._resources[resource_uri] = resource
-               self._last_modified[resource_uri] = datetime.fromtimestamp(
-                   file_path.stat().st_mtime
-               )
+               self._last_modified[resource_uri] = datetime.fromtimestamp(st.st_mtime)
+               self._content_cache[resource_uri] = (key, resource)
                
                return resource
            except Exception as e:
-               print(f"Error reading {file_path}: {e}")
+               log.warning("Error reading %s: %s", file_path, e)
                return types.Resource(
                    uri=resource_uri,
                    name=f"Error: {file_path.name}",
@@ -106,21 +156,23 @@ def init_resources(
 ) -> ResourceManager:
    """Initialize resources for the MCP server."""
    manager = ResourceManager(config)
-   default_source_dir = Path(__file__).parent / "sources"
    source_dirs = [] if source_dirs is None else source_dirs
 
    if not exclude_default:
-       source_dirs.append(default_source_dir)
+       source_dirs.append(_DEFAULT_SOURCE_DIR)
 
    for source_dir in source_dirs:
        if not source_dir.exists():
-           print(f"Warning: Source directory does not exist: {source_dir}")
+           log.warning("Source directory does not exist: %s", source_dir)
            continue
 
        source_parent = source_dir.parent.name
        
-       for file_path in source_dir.rglob("*"):
-           if file_path.is_file():
-               manager.register_resource(mcp, file_path, source_parent)
+       for entry in scandir_files(
+           source_dir, "",
+           manager.config._exclude_names, manager.config._exclude_re
+       ):
+           # Already filtered by the scan.
+           manager._register_resource(mcp, Path(entry.path), source_parent)
 
    return manager
\ No newline at end of file
@@ -4,6 +4,8 @@ from dataclasses import dataclass
 from mcp.server.fastmcp import FastMCP
 import yaml
 
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 @dataclass
 class ServerConfig:
     name: str
@@ -30,14 +32,19 @@ class MCPServer:
 def load_config(config_path: Path) -> ServerConfig:
     config_path = config_path.resolve()
     with open(config_path) as f:
-        config_data = yaml.safe_load(f)
+        config_data = yaml.load(f, Loader=Loader)
 
     base_dir = config_path.parent
+    directories = config_data['directories']
+    dirs = {
+        key: [base_dir.joinpath(p) for p in directories[key]]
+        for key in ('sources', 'implementations', 'templates')
+    }
     return ServerConfig(
         name=config_data['server']['name'],
-        source_dirs=[base_dir / Path(p) for p in config_data['directories']['sources']],
-        implementation_dirs=[base_dir / Path(p) for p in config_data['directories']['implementations']],
-        template_dirs=[base_dir / Path(p) for p in config_data['directories']['templates']]
+        source_dirs=dirs['sources'],
+        implementation_dirs=dirs['implementations'],
+        template_dirs=dirs['templates']
     )
 
 # Load configuration and initialize the server
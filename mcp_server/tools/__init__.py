@@ -1,50 +1,68 @@
+import logging
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Callable
+from typing import List, Optional, Dict, Any, Callable, Union
 import importlib.util
-import inspect
+import sys
+from types import FunctionType
 from dataclasses import dataclass
 import mcp.types as types
 from mcp.server.fastmcp import FastMCP
+from file_scan import is_excluded, scandir_files, split_exclude_patterns
+
+log = logging.getLogger(__name__)
+
+_DEFAULT_IMPLEMENTATION_DIR = Path(__file__).parent / "implementations"
 
 @dataclass
 class ToolConfig:
-    default_dir: Path = Path(__file__).parent / "implementations"
+    default_dir: Path = _DEFAULT_IMPLEMENTATION_DIR
     exclude_patterns: List[str] = None
 
     def __post_init__(self):
         if self.exclude_patterns is None:
             self.exclude_patterns = ["__pycache__", ".git", "__init__.py"]
+        self._exclude_names, self._exclude_re = split_exclude_patterns(self.exclude_patterns)
 
 class ToolManager:
     def __init__(self, config: Optional[ToolConfig] = None):
         self.config = config or ToolConfig()
         self._tools: Dict[str, Callable] = {}
     
-    def should_exclude(self, path: Path) -> bool:
-        return any(pattern in str(path) for pattern in self.config.exclude_patterns)
+    def should_exclude(self, path: Union[str, Path]) -> bool:
+        return is_excluded(path, self.config._exclude_names, self.config._exclude_re)
 
-    def load_module(self, file_path: Path) -> Optional[Any]:
+    def load_module(self, file_path: Path, tool_dir: Optional[Path] = None) -> Optional[Any]:
+        relative = file_path.relative_to(tool_dir) if tool_dir else Path(file_path.name)
+        module_name = "mcp_server.tools." + ".".join(relative.with_suffix("").parts)
+        cached = sys.modules.get(module_name)
+        if cached is not None and getattr(cached, "__file__", None) == str(file_path):
+            return cached
+        # Only claim the sys.modules slot if no other file already holds it.
+        register = cached is None
         try:
-            module_name = f"mcp_server.tools.{file_path.stem}"
             spec = importlib.util.spec_from_file_location(module_name, file_path)
             if spec and spec.loader:
                 module = importlib.util.module_from_spec(spec)
+                if register:
+                    sys.modules[module_name] = module
                 spec.loader.exec_module(module)
                 return module
         except Exception as e:
-            print(f"Error loading module {file_path}: {e}")
+            if register:
+                sys.modules.pop(module_name, None)
+            log.warning("Error loading module %s: %s", file_path, e)
         return None
 
     def register_tools(self, mcp: FastMCP, module: Any):
-        for name, obj in inspect.getmembers(module):
-            if (inspect.isfunction(obj) and 
+        for name, obj in vars(module).items():
+            if (type(obj) is FunctionType and 
                 not name.startswith('_') and 
                 obj.__module__ == module.__name__):
                 try:
                     tool = mcp.tool(name)
                     self._tools[name] = tool(obj)
                 except Exception as e:
-                    print(f"Error registering tool {name}: {e}")
+                    log.warning("Error registering tool %s: %s", name, e)
 
 def init_tools(
     mcp: FastMCP,
@@ -60,14 +78,14 @@ def init_tools(
 
     for tool_dir in tool_dirs:
         if not tool_dir.exists():
-            print(f"Warning: Tool directory does not exist: {tool_dir}")
+            log.warning("Tool directory does not exist: %s", tool_dir)
             continue
 
-        for file_path in tool_dir.rglob("*.py"):
-            if not file_path.is_file() or manager.should_exclude(file_path):
-                continue
-            
-            module = manager.load_module(file_path)
+        for entry in scandir_files(
+            tool_dir, ".py",
+            manager.config._exclude_names, manager.config._exclude_re
+        ):
+            module = manager.load_module(Path(entry.path), tool_dir)
             if module:
                 manager.register_tools(mcp, module)
 
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The server imports its packages as top-level modules (see server.py).
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "mcp_server"))
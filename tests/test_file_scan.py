@@ -0,0 +1,78 @@
+import os
+
+from file_scan import is_excluded, scandir_files, split_exclude_patterns
+
+
+def _names(root, suffix, patterns=()):
+    names, regex = split_exclude_patterns(list(patterns))
+    return sorted(os.path.relpath(e.path, root) for e in scandir_files(root, suffix, names, regex))
+
+
+def test_scandir_files_recurses_and_filters_suffix(tmp_path):
+    (tmp_path / "a.yaml").write_text("")
+    (tmp_path / "b.txt").write_text("")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "c.yaml").write_text("")
+
+    assert _names(tmp_path, ".yaml") == ["a.yaml", os.path.join("sub", "c.yaml")]
+    assert len(_names(tmp_path, "")) == 3
+
+
+def test_scandir_files_prunes_excluded_directories(tmp_path):
+    (tmp_path / "__pycache__").mkdir()
+    (tmp_path / "__pycache__" / "x.yaml").write_text("")
+    (tmp_path / "keep.yaml").write_text("")
+
+    assert _names(tmp_path, ".yaml", ["__pycache__"]) == ["keep.yaml"]
+
+
+def test_scandir_files_follows_file_but_not_directory_symlinks(tmp_path):
+    root = tmp_path / "root"
+    other = tmp_path / "other"
+    root.mkdir()
+    other.mkdir()
+    (other / "x.yaml").write_text("")
+    (root / "link.yaml").symlink_to(other / "x.yaml")
+    (root / "linkdir").symlink_to(other, target_is_directory=True)
+
+    assert _names(root, ".yaml") == ["link.yaml"]
+
+
+def test_scandir_files_skips_unreadable_roots(tmp_path):
+    not_a_dir = tmp_path / "file.yaml"
+    not_a_dir.write_text("")
+
+    assert list(scandir_files(not_a_dir, ".yaml")) == []
+    assert list(scandir_files(tmp_path / "missing", ".yaml")) == []
+
+
+
+def test_split_exclude_patterns():
+    names, regex = split_exclude_patterns(["__pycache__", ".git", "__init__.py", "build/tmp"])
+
+    assert names == {"__pycache__", ".git"}
+    assert regex.search("pkg/__init__.py")
+    assert regex.search("out/build/tmp/x.py")
+    assert split_exclude_patterns([".git"]) == (frozenset({".git"}), None)
+
+
+def test_name_patterns_match_whole_components(tmp_path):
+    for name in (".git", ".github", "src"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "f.yml").write_text("")
+    (tmp_path / ".gitignore").write_text("")
+    names, regex = split_exclude_patterns([".git"])
+
+    assert _names(tmp_path, "", [".git"]) == [
+        ".github/f.yml".replace("/", os.sep), ".gitignore", "src/f.yml".replace("/", os.sep)
+    ]
+    assert is_excluded(tmp_path / ".git" / "f.yml", names, regex)
+    assert not is_excluded(tmp_path / ".github" / "f.yml", names, regex)
+    assert not is_excluded(tmp_path / ".gitignore", names, regex)
+
+
+def test_regex_patterns_only_filter_files(tmp_path):
+    (tmp_path / "__init__.py").write_text("")
+    (tmp_path / "tool.py").write_text("")
+
+    assert _names(tmp_path, ".py", ["__pycache__", "__init__.py"]) == ["tool.py"]
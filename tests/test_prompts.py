@@ -0,0 +1,141 @@
+import asyncio
+
+import pytest
+
+from mcp.server.fastmcp import FastMCP
+
+from prompts import _compile_format, _render, init_prompts
+
+
+def render(mcp, name, arguments=None):
+    result = asyncio.run(mcp.get_prompt(name, {"arguments": arguments or {}}))
+    return [message.content.text for message in result.messages]
+
+
+def test_templates_are_parsed_on_first_use(tmp_path):
+    (tmp_path / "greet.yaml").write_text(
+        "name: greet\n"
+        "description: Greeting\n"
+        "arguments:\n"
+        "  - name: who\n"
+        "messages:\n"
+        "  - role: user\n"
+        "    content: Hello {who}!\n"
+    )
+    mcp = FastMCP("test")
+    manager = init_prompts(mcp, [tmp_path])
+
+    assert "greet" not in manager._templates
+    assert "Hello Bob!" in render(mcp, "greet", {"who": "Bob"})[0]
+    assert "greet" in manager._templates
+
+
+def test_broken_template_returns_error(tmp_path):
+    (tmp_path / "broken.yaml").write_text("name: broken\nmessages: [\n")
+    mcp = FastMCP("test")
+    init_prompts(mcp, [tmp_path])
+
+    assert "failed to load prompt template broken" in render(mcp, "broken")[0]
+
+
+def test_duplicate_name_keeps_first_template(tmp_path, caplog):
+    for label in ("first", "second"):
+        template_dir = tmp_path / label
+        template_dir.mkdir()
+        (template_dir / "dup.yaml").write_text(
+            "name: dup\n"
+            "description: Duplicate\n"
+            "messages:\n"
+            "  - role: user\n"
+            f"    content: from {label}\n"
+        )
+    mcp = FastMCP("test")
+    manager = init_prompts(mcp, [tmp_path / "first", tmp_path / "second"])
+
+    assert manager._sources["dup"] == tmp_path / "first" / "dup.yaml"
+    assert "dup is already defined in" in caplog.text
+    assert "from first" in render(mcp, "dup")[0]
+
+
+
+class User:
+    name = "Ann"
+
+
+@pytest.mark.parametrize("text", [
+    "Hi {who}!",
+    "{who!r:>10} {{literal}}",
+    "{n:{width}}",
+    "{user.name}",
+    "no fields",
+])
+def test_render_matches_str_format(text):
+    args = {"who": "Bob", "n": 7, "width": 4, "user": User()}
+    assert _render(text, _compile_format(text), args) == text.format(**args)
+
+
+def test_compile_format_falls_back_for_full_formatter_syntax():
+    assert _compile_format("Hi {who}") is not None
+    for text in ("{0}", "{}", "{user.name}", "{n:{width}}", "unbalanced {"):
+        assert _compile_format(text) is None
+
+
+def test_template_without_name_header_is_parsed_while_scanning(tmp_path):
+    (tmp_path / "flow.yaml").write_text(
+        '{"name": "flow", "description": "Flow style",'
+        ' "messages": [{"role": "user", "content": "Hi {who}"}]}\n'
+    )
+    mcp = FastMCP("test")
+    manager = init_prompts(mcp, [tmp_path])
+
+    assert "flow" in manager._templates
+    assert "Hi Ann" in render(mcp, "flow", {"who": "Ann"})[0]
+
+
+def test_prompts_register_through_shared_dispatcher(tmp_path):
+    for name in ("one", "two"):
+        (tmp_path / f"{name}.yaml").write_text(
+            f"name: {name}\n"
+            "description: Shared\n"
+            "messages:\n"
+            "  - role: user\n"
+            f"    content: prompt {name}\n"
+        )
+    mcp = FastMCP("test")
+    init_prompts(mcp, [tmp_path])
+    prompts = {prompt.name: prompt for prompt in asyncio.run(mcp.list_prompts())}
+
+    assert sorted(prompts) == ["one", "two"]
+    assert all(not prompt.description for prompt in prompts.values())
+    assert [arg.name for arg in prompts["one"].arguments] == ["arguments"]
+    assert "prompt two" in render(mcp, "two")[0]
+
+
+def test_static_prompt_results_are_reused(tmp_path):
+    (tmp_path / "static.yaml").write_text(
+        "name: static\n"
+        "description: Static\n"
+        "messages:\n"
+        "  - role: user\n"
+        "    content: Hello {{braces}}\n"
+    )
+    (tmp_path / "dynamic.yaml").write_text(
+        "name: dynamic\n"
+        "description: Dynamic\n"
+        "arguments:\n"
+        "  - name: who\n"
+        "messages:\n"
+        "  - role: user\n"
+        "    content: Hello {who}\n"
+    )
+    manager = init_prompts(FastMCP("test"), [tmp_path])
+
+    first = asyncio.run(manager._dispatch("static"))
+    assert first.messages[0].content.text == "Hello {braces}"
+    assert asyncio.run(manager._dispatch("static")) is first
+
+    ann = asyncio.run(manager._dispatch("dynamic", {"who": "Ann"}))
+    bob = asyncio.run(manager._dispatch("dynamic", {"who": "Bob"}))
+    assert bob.messages[0].content.text == "Hello Bob"
+    assert ann.arguments is bob.arguments
+    assert "dynamic" not in manager._static_results
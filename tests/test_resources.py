@@ -0,0 +1,120 @@
+import asyncio
+import json
+import os
+from pathlib import Path
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from resources import ResourceConfig, ResourceManager, init_resources
+
+
+def read_text(mcp, uri):
+    contents = asyncio.run(mcp.read_resource(uri))
+    return "".join(content.content for content in contents)
+
+
+def resource_uris(mcp):
+    return sorted(str(resource.uri) for resource in asyncio.run(mcp.list_resources()))
+
+
+def test_init_resources_skips_excluded_entries(tmp_path):
+    source_dir = tmp_path / "src"
+    (source_dir / ".git").mkdir(parents=True)
+    (source_dir / ".git" / "config").write_text("")
+    (source_dir / ".github").mkdir()
+    (source_dir / ".github" / "ci.yml").write_text("")
+    (source_dir / "notes.md").write_text("")
+    mcp = FastMCP("test")
+    init_resources(mcp, [source_dir], exclude_default=True)
+
+    assert resource_uris(mcp) == [
+        f"file://{tmp_path.name}/ci.yml",
+        f"file://{tmp_path.name}/notes.md",
+    ]
+
+
+def test_register_resource_checks_excludes(tmp_path):
+    (tmp_path / "__pycache__").mkdir()
+    (tmp_path / "__pycache__" / "x.txt").write_text("")
+    mcp = FastMCP("test")
+    ResourceManager().register_resource(mcp, tmp_path / "__pycache__" / "x.txt", "src")
+
+    assert resource_uris(mcp) == []
+
+
+def test_resource_cache_follows_mtime_and_size(tmp_path):
+    path = tmp_path / "src" / "note.txt"
+    path.parent.mkdir()
+    path.write_text("first")
+    mcp = FastMCP("test")
+    manager = init_resources(mcp, [path.parent], exclude_default=True)
+    uri = f"file://{tmp_path.name}/note.txt"
+
+    assert "first" in read_text(mcp, uri)
+    cached = manager._content_cache[uri][1]
+    read_text(mcp, uri)
+    assert manager._content_cache[uri][1] is cached
+
+    # Same mtime, different size.
+    mtime_ns = path.stat().st_mtime_ns
+    path.write_text("second!")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    assert "second!" in read_text(mcp, uri)
+
+    # Same size, different mtime.
+    path.write_text("third!!")
+    os.utime(path, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+    assert "third!!" in read_text(mcp, uri)
+    assert manager.get_last_modified(uri).timestamp() == pytest.approx((mtime_ns + 10**9) / 10**9)
+
+
+@pytest.mark.parametrize("content", [
+    '{"a": [1, 2], "b": {"c": "d"}}',
+    '{"a": NaN, "b": Infinity}',
+    '{"big": 123456789012345678901234567890}',
+])
+def test_json_is_pretty_printed_like_stdlib(content):
+    manager = ResourceManager(ResourceConfig(pretty_print=True))
+    text = manager.parse_structured_content(Path("data.json"), content)
+
+    assert text == json.dumps(json.loads(content), indent=2)
+
+
+@pytest.mark.parametrize("name, content, pretty", [
+    ("data.json", '{"a":1}', '{\n  "a": 1\n}'),
+    ("data.yaml", "a: {b: 1}\n", "a:\n  b: 1\n"),
+])
+def test_structured_content_is_verbatim_unless_pretty_print(name, content, pretty):
+    assert ResourceManager().parse_structured_content(Path(name), content) == content
+    manager = ResourceManager(ResourceConfig(pretty_print=True))
+    assert manager.parse_structured_content(Path(name), content) == pretty
+
+
+def test_resource_bytes_are_served_unchanged(tmp_path):
+    path = tmp_path / "src" / "crlf.txt"
+    path.parent.mkdir()
+    path.write_bytes("caf\u00e9\r\nline\r\n".encode("utf-8"))
+    mcp = FastMCP("test")
+    manager = init_resources(mcp, [path.parent], exclude_default=True)
+    read_text(mcp, f"file://{tmp_path.name}/crlf.txt")
+
+    assert manager.get_resource(f"file://{tmp_path.name}/crlf.txt").text == "caf\u00e9\r\nline\r\n"
+
+
+def test_pretty_print_accepts_bytes():
+    manager = ResourceManager(ResourceConfig(pretty_print=True))
+
+    assert manager.parse_structured_content(Path("data.json"), b'{"a":1}') == '{\n  "a": 1\n}'
+    assert manager.parse_structured_content(Path("data.yml"), b"a: [1]\r\n") == "a:\n- 1\n"
+
+
+def test_read_content_streams_yaml_and_falls_back_to_raw(tmp_path):
+    manager = ResourceManager(ResourceConfig(pretty_print=True))
+    good = tmp_path / "good.yaml"
+    good.write_text("a: {b: [1, 2]}\n")
+    bad = tmp_path / "bad.yaml"
+    bad.write_text("a: [unclosed\n")
+
+    assert manager.read_content(good) == "a:\n  b:\n  - 1\n  - 2\n"
+    assert manager.read_content(bad) == "a: [unclosed\n"
@@ -0,0 +1,79 @@
+import asyncio
+import sys
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from tools import ToolManager, init_tools
+
+
+@pytest.fixture(autouse=True)
+def clean_tool_modules():
+    yield
+    for name in [name for name in sys.modules if name.startswith("mcp_server.tools.")]:
+        del sys.modules[name]
+
+
+def tool_names(mcp):
+    return sorted(tool.name for tool in asyncio.run(mcp.list_tools()))
+
+
+def test_module_name_follows_relative_path(tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    (tmp_path / "a" / "util.py").write_text("def from_a():\n    return 'a'\n")
+    (tmp_path / "b" / "util.py").write_text("def from_b():\n    return 'b'\n")
+    mcp = FastMCP("test")
+    init_tools(mcp, [tmp_path], exclude_default=True)
+
+    assert tool_names(mcp) == ["from_a", "from_b"]
+    assert sys.modules["mcp_server.tools.a.util"].__file__ == str(tmp_path / "a" / "util.py")
+    assert sys.modules["mcp_server.tools.b.util"].__file__ == str(tmp_path / "b" / "util.py")
+
+
+def test_load_module_reuses_imported_module(tmp_path):
+    path = tmp_path / "calc.py"
+    path.write_text("def add(a: int, b: int) -> int:\n    return a + b\n")
+    manager = ToolManager()
+
+    module = manager.load_module(path, tmp_path)
+    assert sys.modules["mcp_server.tools.calc"] is module
+    assert manager.load_module(path, tmp_path) is module
+
+
+def test_same_name_from_other_dir_is_not_registered(tmp_path):
+    for label in ("first", "second"):
+        (tmp_path / label).mkdir()
+        (tmp_path / label / "util.py").write_text(f"def from_{label}():\n    return '{label}'\n")
+    mcp = FastMCP("test")
+    init_tools(mcp, [tmp_path / "first", tmp_path / "second"], exclude_default=True)
+
+    assert tool_names(mcp) == ["from_first", "from_second"]
+    assert sys.modules["mcp_server.tools.util"].__file__ == str(tmp_path / "first" / "util.py")
+
+
+def test_failed_module_is_removed_from_sys_modules(tmp_path):
+    path = tmp_path / "broken.py"
+    path.write_text("raise RuntimeError('boom')\n")
+
+    assert ToolManager().load_module(path, tmp_path) is None
+    assert "mcp_server.tools.broken" not in sys.modules
+
+
+def test_register_tools_only_takes_public_module_functions(tmp_path):
+    (tmp_path / "mixed.py").write_text(
+        "from os.path import join\n"
+        "\n"
+        "def zeta():\n"
+        "    return 1\n"
+        "\n"
+        "def _hidden():\n"
+        "    return 2\n"
+        "\n"
+        "def alpha():\n"
+        "    return 3\n"
+    )
+    mcp = FastMCP("test")
+    manager = init_tools(mcp, [tmp_path], exclude_default=True)
+
+    assert list(manager._tools) == ["zeta", "alpha"]